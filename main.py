@@ -4,6 +4,8 @@ import time
 import math
 import pickle
 import os
+import heapq
+from collections import deque, defaultdict
 import tkinter as tk
 from tkinter import ttk, Canvas
 
@@ -16,6 +18,34 @@ FINISH_SIZE = 40
 SIGHT_RANGE = 100
 POPULATION_SIZE = 30
 GENERATION_TIME = 15  # seconds
+STATS_REFRESH_MS = 100  # GUI stats refresh interval (10 Hz)
+
+# Novelty search
+NOVELTY_K = 10  # neighbours used for the novelty score
+NOVELTY_ARCHIVE_SIZE = 500  # oldest behaviours are dropped beyond this
+NOVELTY_ARCHIVE_ADD = 3  # most novel bots archived per generation
+NOVELTY_WEIGHT = 1.0  # weight of the novelty rank relative to the fitness rank
+CHECKPOINT_SPACING = 100  # descriptor distance between checkpoint indices
+
+class StatsChannel:
+    """Latest-value mailbox between the simulation and the GUI.
+
+    The simulation publishes as often as it likes; the GUI reads the most
+    recent snapshot at its own refresh rate. Each publish rebinds a fresh
+    dict, so readers never see a half-written snapshot and no lock is needed.
+    """
+    def __init__(self):
+        self._latest = {}
+        self._version = 0
+
+    def publish(self, **values):
+        latest = dict(self._latest)
+        latest.update(values)
+        self._latest = latest
+        self._version += 1
+
+    def read(self):
+        return self._version, self._latest
 
 class NeuralNetwork:
     def __init__(self, input_size, hidden_size, output_size):
@@ -155,6 +185,94 @@ class Checkpoint:
         return (self.x - self.width/2 < x < self.x + self.width/2 and
                 self.y - self.height/2 < y < self.y + self.height/2)
 
+class KDTree:
+    """Static k-d tree over behaviour descriptors for k-nearest-neighbour lookups.
+
+    Each node splits on the axis with the widest spread, so constant
+    dimensions (e.g. checkpoint progress on levels without checkpoints)
+    never block pruning.
+
+    >>> rng = random.Random(1)
+    >>> pts = [(rng.uniform(-400, 400), rng.uniform(-300, 300), 0) for _ in range(500)]
+    >>> tree = KDTree(pts)
+    >>> brute = lambda q: sorted(math.dist(p, q) for p in pts)[:11]
+    >>> all(tree.nearest(q, 11) == brute(q) for q in pts[:100])
+    True
+    """
+    def __init__(self, points):
+        self.dims = len(points[0]) if points else 0
+        self.root = self.build(list(points))
+
+    def build(self, points):
+        if not points:
+            return None
+        spreads = [max(p[i] for p in points) - min(p[i] for p in points) for i in range(self.dims)]
+        axis = spreads.index(max(spreads))
+        points.sort(key=lambda p: p[axis])
+        mid = len(points) // 2
+        return (points[mid], axis,
+                self.build(points[:mid]),
+                self.build(points[mid + 1:]))
+
+    def nearest(self, target, k):
+        # Max-heap (negated distances) of the k best candidates so far
+        best = []
+
+        def search(node):
+            if node is None:
+                return
+            point, axis, left, right = node
+            d = math.dist(point, target)
+            if len(best) < k:
+                heapq.heappush(best, -d)
+            elif d < -best[0]:
+                heapq.heapreplace(best, -d)
+
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            search(near)
+            if len(best) < k or abs(diff) < -best[0]:
+                search(far)
+
+        search(self.root)
+        return sorted(-d for d in best)
+
+class NoveltyArchive:
+    """Bounded archive of past behaviours used to score how novel new bots are.
+
+    Game keeps one archive per level mode, so a Maze run builds on what
+    earlier Maze runs archived even when other levels were played in between.
+
+    >>> archives = defaultdict(lambda: NoveltyArchive(max_size=6))
+    >>> bots = [Bot(x, 0) for x in range(-300, 300, 20)]
+    >>> archives["Maze"].score(bots)
+    >>> len(archives["Maze"].behaviors)
+    3
+    >>> archives["Random"].score(bots)
+    >>> archives["Maze"].score(bots)
+    >>> len(archives["Maze"].behaviors), len(archives["Random"].behaviors)
+    (6, 3)
+    >>> archives["Maze"].score(bots)
+    >>> len(archives["Maze"].behaviors)
+    6
+    """
+    def __init__(self, max_size=NOVELTY_ARCHIVE_SIZE, k=NOVELTY_K):
+        self.behaviors = deque(maxlen=max_size)
+        self.k = k
+
+    def score(self, population):
+        """Set bot.novelty to the mean distance to its k nearest behaviours
+        among the archive and the rest of the current population."""
+        descriptors = [bot.behavior() for bot in population]
+        tree = KDTree(list(self.behaviors) + descriptors)
+        for bot, desc in zip(population, descriptors):
+            # The bot's own descriptor is always its nearest neighbour (distance 0)
+            dists = tree.nearest(desc, self.k + 1)[1:]
+            bot.novelty = sum(dists) / len(dists) if dists else 0
+
+        for bot in sorted(population, key=lambda b: b.novelty, reverse=True)[:NOVELTY_ARCHIVE_ADD]:
+            self.behaviors.append(bot.behavior())
+
 class Bot:
     def __init__(self, x, y, brain=None):
         self.x = x
@@ -167,6 +285,7 @@ class Bot:
         self.alive = True
         self.finished = False
         self.fitness = 0
+        self.novelty = 0
         self.checkpoint_index = 0
 
     def update(self, obstacles, finish_line, predator=None, checkpoints=[]):
@@ -214,6 +333,10 @@ class Bot:
                  self.checkpoint_index += 1
                  cp.reached = True
 
+    def behavior(self):
+        # Where the bot ended up and how far along the checkpoint trail it got
+        return (self.x, self.y, self.checkpoint_index * CHECKPOINT_SPACING)
+
     def get_sensors(self, obstacles, finish_line):
         rays = [-30, 0, 30]
         readings = []
@@ -322,6 +445,9 @@ class Game:
         self.level_mode = "Random"
         self.is_paused = False
         self.mutation_rate = 0.1
+        self.novelty_search = False
+        self.novelty_archives = defaultdict(NoveltyArchive)  # one per level mode
+        self.population_mode = self.level_mode  # level the current population ran on
 
     def start(self):
         self.reset_level()
@@ -423,8 +549,19 @@ class Game:
             
             new_pop = [Bot(start_x, 0, brain=self.best_bot.brain.copy())] 
             
+            parents = old_pop[:10]
+            if self.novelty_search:
+                # Rank parents by fitness rank plus novelty rank so deceptive levels
+                # (dead ends in Maze/Wall) don't trap the whole population.
+                # Ranks keep the two terms comparable: raw novelty is in pixels
+                # while fitness can be anywhere from ~1 to several thousand.
+                self.novelty_archives[self.population_mode].score(old_pop)
+                fitness_rank = {id(b): i for i, b in enumerate(old_pop)}
+                novelty_rank = {id(b): i for i, b in enumerate(sorted(old_pop, key=lambda b: b.novelty, reverse=True))}
+                parents = sorted(old_pop, key=lambda b: fitness_rank[id(b)] + NOVELTY_WEIGHT * novelty_rank[id(b)])[:10]
+            
             for _ in range(POPULATION_SIZE - 1):
-                parent = random.choice(old_pop[:10]) 
+                parent = random.choice(parents) 
                 child_brain = parent.brain.copy()
                 child_brain.mutate(self.mutation_rate) # Use dynamic rate
                 new_pop.append(Bot(start_x, 0, brain=child_brain))
@@ -434,6 +571,7 @@ class Game:
             for _ in range(POPULATION_SIZE):
                 self.population.append(Bot(start_x, 0))
         
+        self.population_mode = self.level_mode
         self.start_time = time.time()
         self.app.update_gen_label(self.generation)
 
@@ -559,12 +697,19 @@ class BotRaceApp:
         self.sidebar = ttk.Frame(self.main_container, width=200, padding=10)
         self.sidebar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Stats are published here by the game and pulled by refresh_stats
+        self.stats = StatsChannel()
+        self.stats_version = -1
+        self.label_text = {}
+        self.graph_dirty = False
+        
         self.create_sidebar_widgets()
         
         # Loop
         self.running = True
         self.game.start()
         self.update_loop()
+        self.refresh_stats()
 
     def create_sidebar_widgets(self):
         # Stats
@@ -596,6 +741,9 @@ class BotRaceApp:
         self.fast_mode = tk.BooleanVar()
         ttk.Checkbutton(self.sidebar, text="Fast Mode (No Draw)", variable=self.fast_mode).pack(anchor="w")
         
+        self.novelty_mode = tk.BooleanVar()
+        ttk.Checkbutton(self.sidebar, text="Novelty Search", variable=self.novelty_mode, command=self.toggle_novelty).pack(anchor="w")
+        
         ttk.Label(self.sidebar, text="Mutation Rate").pack(anchor="w", pady=(5,0))
         self.scale_mut = tk.Scale(self.sidebar, from_=0.01, to=1.0, resolution=0.01, orient=tk.HORIZONTAL, command=self.update_mutation)
         self.scale_mut.set(0.1)
@@ -623,25 +771,50 @@ class BotRaceApp:
     def update_mutation(self, val):
         self.game.mutation_rate = float(val)
 
+    def toggle_novelty(self):
+        self.game.novelty_search = self.novelty_mode.get()
+
     def toggle_camera(self):
         self.game.camera_follow = not self.game.camera_follow
 
     def update_stats(self, time_left, alive, fitness):
-        self.lbl_time.config(text=f"Time: {max(0, time_left):.1f}")
-        self.lbl_alive.config(text=f"Alive: {alive}")
-        self.lbl_fit.config(text=f"Best Fit: {fitness:.0f}")
+        self.stats.publish(time_left=time_left, alive=alive, fitness=fitness)
 
     def update_gen_label(self, gen):
-        self.lbl_gen.config(text=f"Gen: {gen}")
+        self.stats.publish(gen=gen)
 
     def update_level_label(self, level):
-        self.lbl_level.config(text=f"Level: {level}")
+        self.stats.publish(level=level)
 
     def add_data_point(self, gen, fitness):
         self.fitness_history.append(fitness)
         if len(self.fitness_history) > 20:
             self.fitness_history.pop(0)
-        self.draw_graph()
+        self.graph_dirty = True
+
+    def set_label(self, label, text):
+        # Only touch the widget when the text actually changes
+        if self.label_text.get(label) != text:
+            self.label_text[label] = text
+            label.config(text=text)
+
+    def refresh_stats(self):
+        if not self.running: return
+        version, stats = self.stats.read()
+        if version != self.stats_version:
+            self.stats_version = version
+            if "gen" in stats:
+                self.set_label(self.lbl_gen, f"Gen: {stats['gen']}")
+            if "level" in stats:
+                self.set_label(self.lbl_level, f"Level: {stats['level']}")
+            if "time_left" in stats:
+                self.set_label(self.lbl_time, f"Time: {max(0, stats['time_left']):.1f}")
+                self.set_label(self.lbl_alive, f"Alive: {stats['alive']}")
+                self.set_label(self.lbl_fit, f"Best Fit: {stats['fitness']:.0f}")
+        if self.graph_dirty:
+            self.graph_dirty = False
+            self.draw_graph()
+        self.root.after(STATS_REFRESH_MS, self.refresh_stats)
 
     def draw_graph(self):
         self.graph_canvas.delete("all")